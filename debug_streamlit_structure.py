@@ -6,130 +6,226 @@ to detect if a site is running properly.
 
 import asyncio
 import json
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from playwright.async_api import async_playwright
 from utils.config_loader import load_and_validate_config
+from utils.http_probe import quick_http_probe
 
-async def debug_site_structure(site):
-    """Debug the structure of a single site."""
-    print(f"\n=== DEBUGGING {site['name'].upper()} ===")
-    print(f"URL: {site['url']}")
-    print(f"Looking for: {site['must_contain']}")
+MAX_CONCURRENT_SITES = 4
+
+# Fetched HTML is never reused by default so each run sees the live site;
+# pass --cache-max-age to reuse it across repeated runs
+HTTP_CACHE_MAX_AGE = 0
+
+# Any of these means the Streamlit app (or its hosting shell) has rendered
+APP_READY_SELECTOR = 'iframe[title*="streamlit"], div.stApp, [data-testid="stApp"]'
+
+# Report which selectors match in a single page.evaluate round-trip
+SELECTORS_PRESENT_JS = "(selectors) => selectors.map(s => !!document.querySelector(s))"
+
+# Needle check plus title/src of every iframe in one round-trip, without
+# shipping the page HTML back over CDP
+PAGE_SUMMARY_JS = """(needle) => ({
+    found: document.documentElement.outerHTML.includes(needle),
+    iframes: Array.from(document.querySelectorAll('iframe')).map(f => ({
+        title: f.getAttribute('title'),
+        src: f.getAttribute('src'),
+    })),
+})"""
+
+# For each [css, text] probe return the first matching element's text, or null
+WAKEUP_BUTTON_TEXT_JS = """(probes) => probes.map(([css, text]) => {
+    const el = Array.from(document.querySelectorAll(css)).find(
+        e => !text || e.textContent.toLowerCase().includes(text.toLowerCase())
+    );
+    return el ? el.textContent : null;
+})"""
+
+
+def say(site, message):
+    """Print a message prefixed with the site name so interleaved output stays readable."""
+    print(f"[{site['name']}] {message}")
+
+
+def write_html(path, html):
+    """Write an HTML dump to disk."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(html)
+
+
+async def dump_html(path, html):
+    """Write an HTML dump on a worker thread so the event loop keeps serving other sites."""
+    await asyncio.to_thread(write_html, path, html)
+
+
+async def debug_site_structure(site, browser, cache_max_age=HTTP_CACHE_MAX_AGE):
+    """Debug the structure of a single site in its own context on a shared browser."""
+    say(site, f"=== DEBUGGING {site['name'].upper()} ===")
+    say(site, f"URL: {site['url']}")
+    say(site, f"Looking for: {site['must_contain']}")
     
-    async with async_playwright() as playwright:
-        browser = await playwright.chromium.launch(headless=True)  # Run headless for server environment
-        page = await browser.new_page()
+    # Streamlit apps serve the same static shell asleep or awake, so only
+    # non-Streamlit sites can be settled from static HTML
+    if not site["is_streamlit"] and await quick_http_probe(site, max_age=cache_max_age):
+        say(site, "  ✓ Found expected text in static HTML — skipping browser")
+        return
+    
+    context = await browser.new_context()
+    
+    try:
+        # Inside the try so a failed page still closes its context
+        page = await context.new_page()
         
+        say(site, f"1. Loading page...")
+        await page.goto(site['url'], wait_until="domcontentloaded", timeout=15000)
+        
+        say(site, f"1b. Waiting for content to load...")
         try:
-            print(f"\n1. Loading page...")
-            await page.goto(site['url'], timeout=15000)
-            
-            print(f"\n1b. Waiting for content to load...")
-            await page.wait_for_load_state("networkidle", timeout=10000)
-            await page.wait_for_timeout(3000)  # Extra wait for dynamic content
-            
-            print(f"\n2. Page title: {await page.title()}")
-            
-            print(f"\n3. Looking for iframes...")
-            iframes = await page.query_selector_all('iframe')
-            print(f"Found {len(iframes)} iframe(s)")
-            
-            for i, iframe in enumerate(iframes):
-                title = await iframe.get_attribute('title')
-                src = await iframe.get_attribute('src')
-                print(f"  Iframe {i}: title='{title}', src='{src[:100]}...' if src else 'no src'")
-            
-            print(f"\n4. Looking for Streamlit-specific elements...")
-            # Check for various Streamlit selectors
-            selectors_to_check = [
-                'iframe[title="streamlitApp"]',
-                'iframe[title*="streamlit"]',
-                'iframe[src*="streamlit"]',
-                'div.stApp',
-                '[data-testid="stApp"]',
-                '#root',
-                'main',
-                '.streamlit-container'
-            ]
-            
-            for selector in selectors_to_check:
-                element = await page.query_selector(selector)
-                if element:
-                    print(f"  ✓ Found: {selector}")
-                else:
-                    print(f"  ✗ Missing: {selector}")
-            
-            print(f"\n5. Checking page content for expected text...")
-            content = await page.content()
-            if site['must_contain'] in content:
-                print(f"  ✓ Found expected text: '{site['must_contain']}'")
+            # Return as soon as the app shell renders instead of sleeping
+            await page.wait_for_selector(APP_READY_SELECTOR, timeout=5000)
+        except PlaywrightTimeoutError:
+            say(site, "  App shell not rendered after 5s, inspecting anyway")
+        
+        say(site, f"2. Page title: {await page.title()}")
+        
+        say(site, f"3. Looking for iframes...")
+        iframes = await page.query_selector_all('iframe')
+        summary = await page.evaluate(PAGE_SUMMARY_JS, site['must_contain'])
+        iframe_info = summary["iframes"]
+        say(site, f"Found {len(iframe_info)} iframe(s)")
+        
+        for i, info in enumerate(iframe_info):
+            src = f"'{info['src'][:100]}...'" if info["src"] else "no src"
+            say(site, f"  Iframe {i}: title='{info['title']}', src={src}")
+        
+        say(site, f"4. Looking for Streamlit-specific elements...")
+        # Check for various Streamlit selectors
+        selectors_to_check = [
+            'iframe[title="streamlitApp"]',
+            'iframe[title*="streamlit"]',
+            'iframe[src*="streamlit"]',
+            'div.stApp',
+            '[data-testid="stApp"]',
+            '#root',
+            'main',
+            '.streamlit-container'
+        ]
+        
+        # One round-trip for every selector instead of one query each
+        matches = await page.evaluate(SELECTORS_PRESENT_JS, selectors_to_check)
+        for selector, found in zip(selectors_to_check, matches):
+            if found:
+                say(site, f"  ✓ Found: {selector}")
             else:
-                print(f"  ✗ Expected text NOT found: '{site['must_contain']}'")
-            
-            print(f"\n6. Looking for wake-up buttons...")
-            wakeup_selectors = [
-                'button[data-testid="wakeup-button-owner"]',
-                'button[data-testid="wakeup-button-viewer"]',
-                'button:has-text("Yes, get this app back up!")',
-                'button:has-text("Wake up")',
-                'button:has-text("Restart")'
-            ]
-            
-            for selector in wakeup_selectors:
-                element = await page.query_selector(selector)
-                if element:
-                    text = await element.text_content()
-                    print(f"  ✓ Found wake-up button: {selector} -> '{text}'")
-                else:
-                    print(f"  ✗ No wake-up button: {selector}")
-            
-            print(f"\n7. Saving full HTML for inspection...")
-            with open(f"logs/debug_{site['name']}_full.html", "w", encoding="utf-8") as f:
-                f.write(content)
-            print(f"  Saved to: logs/debug_{site['name']}_full.html")
-            
-            # Try to get iframe content if iframe exists
-            if iframes:
-                print(f"\n8. Attempting to access iframe content...")
-                for i, iframe in enumerate(iframes):
-                    try:
-                        frame = await iframe.content_frame()
-                        if frame:
-                            iframe_content = await frame.content()
-                            print(f"  Iframe {i}: Got content ({len(iframe_content)} chars)")
-                            
-                            if site['must_contain'] in iframe_content:
-                                print(f"  ✓ Found expected text in iframe {i}: '{site['must_contain']}'")
-                            else:
-                                print(f"  ✗ Expected text NOT found in iframe {i}: '{site['must_contain']}'")
-                            
-                            with open(f"logs/debug_{site['name']}_iframe_{i}.html", "w", encoding="utf-8") as f:
-                                f.write(iframe_content)
-                            print(f"  Saved iframe {i} to: logs/debug_{site['name']}_iframe_{i}.html")
+                say(site, f"  ✗ Missing: {selector}")
+        
+        say(site, f"5. Checking page content for expected text...")
+        if summary["found"]:
+            say(site, f"  ✓ Found expected text: '{site['must_contain']}'")
+        else:
+            say(site, f"  ✗ Expected text NOT found: '{site['must_contain']}'")
+        
+        say(site, f"6. Looking for wake-up buttons...")
+        # (css, text) pairs; text mirrors Playwright's :has-text(), which
+        # document.querySelector() can't parse, so it is matched in-page
+        wakeup_probes = [
+            ('button[data-testid="wakeup-button-owner"]', None),
+            ('button[data-testid="wakeup-button-viewer"]', None),
+            ('button', "Yes, get this app back up!"),
+            ('button', "Wake up"),
+            ('button', "Restart")
+        ]
+        
+        texts = await page.evaluate(WAKEUP_BUTTON_TEXT_JS, wakeup_probes)
+        for (css, needle), text in zip(wakeup_probes, texts):
+            selector = f'{css}:has-text("{needle}")' if needle else css
+            if text is not None:
+                say(site, f"  ✓ Found wake-up button: {selector} -> '{text}'")
+            else:
+                say(site, f"  ✗ No wake-up button: {selector}")
+        
+        # Only pull the full page HTML when there is something to inspect
+        if not summary["found"] or site.get("log_raw"):
+            say(site, f"7. Saving full HTML for inspection...")
+            full_path = f"logs/debug_{site['name']}_full.html"
+            await dump_html(full_path, await page.content())
+            say(site, f"  Saved to: {full_path}")
+        else:
+            say(site, f"7. Expected text present — skipping full HTML dump (set log_raw to force)")
+        
+        # Try to get iframe content if iframe exists
+        if iframes:
+            say(site, f"8. Attempting to access iframe content...")
+            iframe_dumps = []
+            for i, iframe in enumerate(iframes):
+                try:
+                    frame = await iframe.content_frame()
+                    if frame:
+                        iframe_content = await frame.content()
+                        say(site, f"  Iframe {i}: Got content ({len(iframe_content)} chars)")
+                        
+                        if site['must_contain'] in iframe_content:
+                            say(site, f"  ✓ Found expected text in iframe {i}: '{site['must_contain']}'")
                         else:
-                            print(f"  Iframe {i}: Could not access content frame")
-                    except Exception as e:
-                        print(f"  Iframe {i}: Error accessing content: {e}")
+                            say(site, f"  ✗ Expected text NOT found in iframe {i}: '{site['must_contain']}'")
+                        
+                        iframe_dumps.append(
+                            (i, f"logs/debug_{site['name']}_iframe_{i}.html", iframe_content)
+                        )
+                    else:
+                        say(site, f"  Iframe {i}: Could not access content frame")
+                except Exception as e:
+                    say(site, f"  Iframe {i}: Error accessing content: {e}")
             
-        except Exception as e:
-            print(f"ERROR: {e}")
-        finally:
-            await browser.close()
+            # Write every iframe dump for this site concurrently
+            await asyncio.gather(*(dump_html(path, html) for _, path, html in iframe_dumps))
+            for i, path, _ in iframe_dumps:
+                say(site, f"  Saved iframe {i} to: {path}")
+        
+    except Exception as e:
+        say(site, f"ERROR: {e}")
+    finally:
+        await context.close()
 
-async def main():
-    """Debug all configured sites."""
+async def main(cache_max_age=HTTP_CACHE_MAX_AGE):
+    """Debug all configured sites concurrently."""
     sites = load_and_validate_config("config/sites.json")
     
     print("Streamlit Structure Debug Tool")
     print("=" * 50)
     
-    for site in sites:
-        await debug_site_structure(site)
+    # Cap in-flight sites so a large config doesn't exhaust memory
+    slots = asyncio.Semaphore(MAX_CONCURRENT_SITES)
+
+    async with async_playwright() as playwright:
+        # One headless browser for every site; each site gets a fresh context
+        browser = await playwright.chromium.launch(headless=True)
+
+        async def bounded(site):
+            async with slots:
+                await debug_site_structure(site, browser, cache_max_age)
+
+        try:
+            await asyncio.gather(*(bounded(site) for site in sites))
+        finally:
+            await browser.close()
     
     print(f"\n=== SUMMARY ===")
     print("Check the logs/debug_*.html files to analyze the actual page structure.")
     print("This will help identify the best selectors for detecting running sites.")
 
 if __name__ == "__main__":
+    import argparse
     import os
+
+    parser = argparse.ArgumentParser(description="Inspect Streamlit site structure.")
+    parser.add_argument(
+        "--cache-max-age",
+        type=float,
+        default=HTTP_CACHE_MAX_AGE,
+        help="Reuse fetched HTML up to this many seconds old (default: 0, always refetch)",
+    )
+    args = parser.parse_args()
+
     os.makedirs("logs", exist_ok=True)
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main(args.cache_max_age))
\ No newline at end of file
@@ -18,6 +18,7 @@ USAGE:
 COMMANDS:
     list                    List all configured sites
     check                   Check site uptime
+    daemon                  Re-check sites on an interval with a persistent browser
     add                     Add a new site to configuration
     remove                  Remove a site from configuration
     validate                Validate configuration file
@@ -28,6 +29,12 @@ CHECK OPTIONS:
     --dry-run              Only check content, do not restart
     --site <name>          Only check the specified site by name (legacy)
     --config <path>        Path to sites configuration file
+    --max-concurrency <n>  Max sites checked at once (default: \$TICKLE_CONCURRENCY or min(sites, 2 x CPUs))
+
+DAEMON OPTIONS:
+    --interval <seconds>   Seconds between check cycles (default: 3600)
+    --max-concurrency <n>  Max sites checked at once
+    --dry-run              Only check content, do not restart
 
 ADD OPTIONS:
     <name> <url> <must_contain>    Site details (required)
@@ -36,6 +43,7 @@ ADD OPTIONS:
     --selector <css>               Custom CSS selector
     --dry-run                      Preview without adding
     --interactive, -i              Interactive guided addition
+    --backup                       Keep a timestamped config backup
 
 REMOVE OPTIONS:
     <name>                         Site name to remove
@@ -47,6 +55,7 @@ EXAMPLES:
     $(basename "$0") --site lookout                 # Check specific site (legacy)
     $(basename "$0") list                            # List all configured sites
     $(basename "$0") check lookout --dry-run        # Check specific site safely
+    $(basename "$0") daemon --interval 900          # Re-check every 15 minutes
     $(basename "$0") add mysite https://example.com "Welcome" --streamlit
     $(basename "$0") add --interactive              # Interactive guided addition
     $(basename "$0") add mysite https://example.com "Welcome" --dry-run  # Preview before adding
@@ -79,7 +88,7 @@ if [[ $# -eq 0 ]]; then
 elif [[ "$1" == "help" ]] || [[ "$1" == "-h" ]] || [[ "$1" == "--help" ]]; then
     print_help
     exit 0
-elif [[ "$1" != "list" && "$1" != "check" && "$1" != "add" && "$1" != "remove" && "$1" != "validate" ]]; then
+elif [[ "$1" != "list" && "$1" != "check" && "$1" != "daemon" && "$1" != "add" && "$1" != "remove" && "$1" != "validate" ]]; then
     # If first arg is not a command, assume it's an option for 'check'
     cd "$SCRIPT_DIR"
     exec "$PYTHON_CMD" -m tickle_streamlit check "$@"
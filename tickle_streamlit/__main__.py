@@ -5,8 +5,6 @@ Main entry point for tickle_streamlit CLI.
 Usage: python -m tickle_streamlit <command> [options]
 """
 
-import argparse
-import asyncio
 import sys
 from .cli import main
 
@@ -7,25 +7,57 @@ Provides subcommands for checking, listing, and managing monitored sites.
 import argparse
 import asyncio
 import json
+import re
 import shutil
 import sys
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any
 
-# Add parent directory to path for imports
-current_dir = Path(__file__).parent
-parent_dir = current_dir.parent
-sys.path.insert(0, str(parent_dir))
-sys.path.insert(0, str(current_dir))
-
-from utils.config_loader import load_and_validate_config, is_valid_url
+from utils.config_loader import (
+    load_config,
+    load_and_validate_config,
+    save_config,
+    is_valid_url,
+)
 from utils.log_util import app_logger
-import core
-check_sites = core.check_sites
+
+from .core import STATUS_SYMBOLS, check_sites
+from .daemon import DEFAULT_INTERVAL, run_daemon
 
 logger = app_logger(__name__)
 
+SITE_NAME_RE = re.compile(r"[A-Za-z0-9_-]+")
+
+
+def positive_int(value: str) -> int:
+    """Argparse type for counts that must be at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{value}' is not an integer")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def positive_float(value: str) -> float:
+    """Argparse type for durations that must be greater than 0."""
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{value}' is not a number")
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return number
+
+
+def site_flags(site: dict) -> str:
+    """Return the bracketed flag suffix for a site listing, or '' if none apply."""
+    if site.get("is_streamlit"):
+        return " [Streamlit, debug]" if site.get("log_raw") else " [Streamlit]"
+    return " [debug]" if site.get("log_raw") else ""
+
 
 def cmd_list(args):
     """List all configured sites."""
@@ -40,14 +72,7 @@ def cmd_list(args):
         print("-" * 60)
         
         for site in sites:
-            status_flags = []
-            if site.get("is_streamlit"):
-                status_flags.append("Streamlit")
-            if site.get("log_raw"):
-                status_flags.append("debug")
-                
-            flags = f" [{', '.join(status_flags)}]" if status_flags else ""
-            print(f"• {site['name']:<20} {site['url']:<40}{flags}")
+            print(f"• {site['name']:<20} {site['url']:<40}{site_flags(site)}")
             print(f"  Must contain: '{site['must_contain']}'")
             
         return 0
@@ -65,22 +90,15 @@ def cmd_check(args):
         results = asyncio.run(check_sites(
             config_path=args.config,
             site_name=site_name,
-            dry_run=args.dry_run
+            dry_run=args.dry_run,
+            max_concurrency=args.max_concurrency
         ))
         
         # Print summary
         print("\nCheck Results:")
         print("-" * 40)
         for result in results:
-            status_symbol = {
-                "up": "✅",
-                "down": "❌", 
-                "restarted": "🔄",
-                "error": "⚠️",
-                "invalid": "❓",
-                "dry_run": "🔍"
-            }.get(result["status"], "❓")
-            
+            status_symbol = STATUS_SYMBOLS.get(result["status"], "❓")
             print(f"{status_symbol} {result['name']:<20} {result['status']}")
             
         return 0
@@ -90,6 +108,24 @@ def cmd_check(args):
         return 1
 
 
+def cmd_daemon(args):
+    """Run checks on a schedule with a persistent browser."""
+    print(f"🔁 Checking sites every {args.interval}s (Ctrl+C to stop)")
+    try:
+        asyncio.run(run_daemon(
+            config_path=args.config,
+            interval=args.interval,
+            dry_run=args.dry_run,
+            max_concurrency=args.max_concurrency
+        ))
+    except KeyboardInterrupt:
+        print("\n👋 Daemon stopped")
+    except Exception as e:
+        logger.error(f"Daemon failed: {e}")
+        return 1
+    return 0
+
+
 def backup_config(config_path: Path) -> Path:
     """Create a backup of the config file."""
     if not config_path.exists():
@@ -112,31 +148,41 @@ def restore_config(config_path: Path, backup_path: Path) -> bool:
     return False
 
 
+def validate_name(name: str) -> List[str]:
+    """Validate a site name and return list of errors."""
+    stripped = (name or "").strip()
+    if not stripped:
+        return ["Site name cannot be empty"]
+    if len(stripped) < 2:
+        return ["Site name must be at least 2 characters"]
+    if not SITE_NAME_RE.fullmatch(name):
+        return ["Site name can only contain letters, numbers, hyphens, and underscores"]
+    return []
+
+
+def validate_url(url: str) -> List[str]:
+    """Validate a site URL and return list of errors."""
+    stripped = (url or "").strip()
+    if not stripped:
+        return ["URL cannot be empty"]
+    if not is_valid_url(stripped):
+        return ["Invalid URL format"]
+    return []
+
+
+def validate_must_contain(must_contain: str) -> List[str]:
+    """Validate the must_contain text and return list of errors."""
+    stripped = (must_contain or "").strip()
+    if not stripped:
+        return ["Must contain text cannot be empty"]
+    if len(stripped) < 3:
+        return ["Must contain text must be at least 3 characters"]
+    return []
+
+
 def validate_site_data(name: str, url: str, must_contain: str) -> List[str]:
     """Validate site data and return list of errors."""
-    errors = []
-    
-    # Name validation
-    if not name or not name.strip():
-        errors.append("Site name cannot be empty")
-    elif len(name.strip()) < 2:
-        errors.append("Site name must be at least 2 characters")
-    elif not all(c.isalnum() or c in '-_' for c in name):
-        errors.append("Site name can only contain letters, numbers, hyphens, and underscores")
-    
-    # URL validation
-    if not url or not url.strip():
-        errors.append("URL cannot be empty")
-    elif not is_valid_url(url.strip()):
-        errors.append("Invalid URL format")
-    
-    # Must contain validation
-    if not must_contain or not must_contain.strip():
-        errors.append("Must contain text cannot be empty")
-    elif len(must_contain.strip()) < 3:
-        errors.append("Must contain text must be at least 3 characters")
-    
-    return errors
+    return validate_name(name) + validate_url(url) + validate_must_contain(must_contain)
 
 
 def interactive_add_site(config_path: Path) -> bool:
@@ -147,29 +193,26 @@ def interactive_add_site(config_path: Path) -> bool:
     # Get site name
     while True:
         name = input("Site name (unique identifier): ").strip()
-        errors = validate_site_data(name, "https://example.com", "test")
-        name_errors = [e for e in errors if "name" in e.lower()]
-        if not name_errors:
+        errors = validate_name(name)
+        if not errors:
             break
-        print(f"❌ {', '.join(name_errors)}")
+        print(f"❌ {', '.join(errors)}")
     
     # Get URL
     while True:
         url = input("Site URL (e.g., https://example.com): ").strip()
-        errors = validate_site_data("test", url, "test")
-        url_errors = [e for e in errors if "url" in e.lower()]
-        if not url_errors:
+        errors = validate_url(url)
+        if not errors:
             break
-        print(f"❌ {', '.join(url_errors)}")
+        print(f"❌ {', '.join(errors)}")
     
     # Get must_contain
     while True:
         must_contain = input("Text that must be present on page: ").strip()
-        errors = validate_site_data("test", "https://example.com", must_contain)
-        content_errors = [e for e in errors if "must contain" in e.lower()]
-        if not content_errors:
+        errors = validate_must_contain(must_contain)
+        if not errors:
             break
-        print(f"❌ {', '.join(content_errors)}")
+        print(f"❌ {', '.join(errors)}")
     
     # Get optional settings
     streamlit = input("Is this a Streamlit app? (y/N): ").strip().lower() in ('y', 'yes')
@@ -196,14 +239,10 @@ def interactive_add_site(config_path: Path) -> bool:
     # Add the site
     try:
         # Load existing config
-        if config_path.exists():
-            with open(config_path, 'r') as f:
-                sites = json.load(f)
-        else:
-            sites = []
+        sites = load_config(config_path)
         
         # Check for duplicate names
-        existing_names = [site.get('name') for site in sites]
+        existing_names = {site.get('name') for site in sites}
         if name in existing_names:
             print(f"❌ Site '{name}' already exists")
             return False
@@ -221,9 +260,7 @@ def interactive_add_site(config_path: Path) -> bool:
         sites.append(new_site)
         
         # Save config
-        config_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(config_path, 'w') as f:
-            json.dump(sites, f, indent=2)
+        save_config(config_path, sites)
         
         print(f"✅ Added site '{name}' to configuration")
         return True
@@ -249,14 +286,10 @@ def cmd_add(args):
             return 1
         
         # Load existing config
-        if config_path.exists():
-            with open(config_path, 'r') as f:
-                sites = json.load(f)
-        else:
-            sites = []
+        sites = load_config(config_path)
         
         # Check for duplicate names
-        existing_names = [site.get('name') for site in sites]
+        existing_names = {site.get('name') for site in sites}
         if args.name in existing_names:
             print(f"❌ Site '{args.name}' already exists")
             return 1
@@ -278,16 +311,14 @@ def cmd_add(args):
             print(json.dumps(new_site, indent=2))
             return 0
         
-        # Create backup
-        backup_path = backup_config(config_path)
+        # save_config() is atomic, so a backup is only kept on request
+        backup_path = backup_config(config_path) if args.backup else None
         
         try:
             sites.append(new_site)
             
             # Save config
-            config_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(config_path, 'w') as f:
-                json.dump(sites, f, indent=2)
+            save_config(config_path, sites)
             
             print(f"✅ Added site '{args.name}' to configuration")
             print(f"   URL: {args.url}")
@@ -302,7 +333,7 @@ def cmd_add(args):
             
         except Exception as e:
             # Restore from backup on failure
-            if restore_config(config_path, backup_path):
+            if backup_path and restore_config(config_path, backup_path):
                 print("🔄 Restored config from backup due to error")
             raise e
         
@@ -321,8 +352,7 @@ def cmd_remove(args):
             print(f"❌ Configuration file not found: {config_path}")
             return 1
         
-        with open(config_path, 'r') as f:
-            sites = json.load(f)
+        sites = load_config(config_path)
         
         # Find and remove site
         original_count = len(sites)
@@ -333,8 +363,7 @@ def cmd_remove(args):
             return 1
         
         # Save updated config
-        with open(config_path, 'w') as f:
-            json.dump(sites, f, indent=2)
+        save_config(config_path, sites)
         
         print(f"✅ Removed site '{args.name}' from configuration")
         return 0
@@ -391,6 +420,7 @@ def main():
   %(prog)s check lookout                  # Check specific site
   %(prog)s check --site lookout           # Check specific site (legacy)
   %(prog)s check --dry-run                # Check without restarting
+  %(prog)s daemon --interval 900          # Re-check every 15 minutes
   %(prog)s add mysite https://example.com "Welcome" --streamlit
   %(prog)s add --interactive              # Interactive guided addition
   %(prog)s add mysite https://example.com "Welcome" --dry-run  # Preview before adding
@@ -428,8 +458,33 @@ def main():
         action="store_true", 
         help="Only check content, do not restart"
     )
+    check_parser.add_argument(
+        "--max-concurrency",
+        type=positive_int,
+        help="Max sites checked at once (default: $TICKLE_CONCURRENCY or min(sites, 2 x CPU count))"
+    )
     check_parser.set_defaults(func=cmd_check)
     
+    # Daemon command
+    daemon_parser = subparsers.add_parser("daemon", help="Run checks on a schedule with a persistent browser")
+    daemon_parser.add_argument(
+        "--interval",
+        type=positive_float,
+        default=DEFAULT_INTERVAL,
+        help=f"Seconds between check cycles (default: {DEFAULT_INTERVAL})"
+    )
+    daemon_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only check content, do not restart"
+    )
+    daemon_parser.add_argument(
+        "--max-concurrency",
+        type=positive_int,
+        help="Max sites checked at once (default: $TICKLE_CONCURRENCY or min(sites, 2 x CPU count))"
+    )
+    daemon_parser.set_defaults(func=cmd_daemon)
+    
     # Add command
     add_parser = subparsers.add_parser("add", help="Add a new site to configuration")
     add_parser.add_argument("name", nargs='?', help="Site name (unique identifier)")
@@ -440,6 +495,7 @@ def main():
     add_parser.add_argument("--selector", help="CSS selector (default: div.stApp for Streamlit, body for others)")
     add_parser.add_argument("--dry-run", action="store_true", help="Show what would be added without modifying config")
     add_parser.add_argument("--interactive", "-i", action="store_true", help="Interactive mode for guided site addition")
+    add_parser.add_argument("--backup", action="store_true", help="Keep a timestamped copy of the config before writing")
     add_parser.set_defaults(func=cmd_add)
     
     # Remove command
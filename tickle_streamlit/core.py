@@ -6,82 +6,170 @@ Extracted from uptime_check.py to provide a clean API for the CLI.
 
 import asyncio
 import os
+import re
 from datetime import datetime
-from urllib.parse import urlparse
 
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from playwright.async_api import async_playwright
 
-from utils.config_loader import load_and_validate_config
+from utils.config_loader import load_and_validate_config, load_site_index
+from utils.http_probe import quick_http_probe
 from utils.log_util import app_logger, log_site
 from utils.site_monitor import restart_site_if_needed, log_raw_html
 
 logger = app_logger(__name__, log_file="logs/uptime.log")
 
+# Console symbol for each check status; unknown statuses print as "❓"
+STATUS_SYMBOLS = {
+    "up": "✅",
+    "down": "❌",
+    "restarted": "🔄",
+    "error": "⚠️",
+    "invalid": "❓",
+    "dry_run": "🔍"
+}
 
-def is_valid_url(url: str) -> bool:
-    """Validate a URL string for presence of scheme and hostname."""
-    parsed = urlparse(url)
-    return all([parsed.scheme, parsed.netloc])
+# Streamlit Cloud renders the app inside this iframe
+IFRAME_SEL = 'iframe[title="streamlitApp"]'
+
+# Event-driven waits (ms) return as soon as the element appears, so these are
+# generous: a slow-but-healthy app must not be mistaken for a sleeping one
+IFRAME_TIMEOUT = 15000
+NEEDLE_TIMEOUT = 15000
+
+# Hard cap on one site's full check, restart included, so a hung page can't
+# stall the run; the slowest normal path (wake-up and re-check) is ~80s
+SITE_CHECK_TIMEOUT = 120
+
+# Resource types that never affect whether must_contain renders
+DEFAULT_BLOCKED_RESOURCES = ["image", "font", "media", "stylesheet"]
+
+# Streamlit's wake-up button must be laid out to be clickable, so keep its CSS
+STREAMLIT_BLOCKED_RESOURCES = ["image", "font", "media"]
+
+
+async def dump_page_html(page, site, suffix: str) -> None:
+    """Dump the page HTML for inspection; serializes nothing unless log_raw is set."""
+    if not site.get("log_raw"):
+        return
+    try:
+        html = await page.content()
+        await log_raw_html(html, site, suffix=suffix)
+    except Exception as dump_err:
+        log_site("warning", logger, site, f"failed to dump page HTML: {dump_err}")
+
+
+async def block_resources(target, blocked: frozenset) -> None:
+    """
+    Abort requests for resource types the check doesn't need.
+
+    :param target: Browser context or page the site is checked in.
+    :param blocked: Playwright resource types to abort; empty disables routing.
+    :return: None
+    """
+    if not blocked:
+        return
+
+    async def handle(route):
+        if route.request.resource_type in blocked:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await target.route("**/*", handle)
+
+
+async def wait_for_iframe(page, timeout: int):
+    """Return the Streamlit app iframe once attached, or None if it never appears."""
+    try:
+        return await page.wait_for_selector(IFRAME_SEL, state="attached", timeout=timeout)
+    except PlaywrightTimeoutError:
+        return None
+
+
+async def wait_for_needle(frame, needle: str, timeout: int = NEEDLE_TIMEOUT) -> bool:
+    """Wait until the needle text renders in the frame; False if it never did."""
+    try:
+        # A plain string would match case-insensitively; a regex without
+        # flags keeps must_contain's case-sensitive substring semantics
+        pattern = re.compile(re.escape(needle))
+        await frame.get_by_text(pattern).first.wait_for(timeout=timeout)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+async def frame_contains_needle(frame, site, suffix: str) -> bool:
+    """
+    Check the iframe for must_contain, serializing its HTML only when log_raw is set.
+
+    :param frame: The Streamlit app frame.
+    :param site: Dictionary with site metadata.
+    :param suffix: Dump filename suffix identifying the check stage.
+    :return: True if the needle is present in the frame.
+    """
+    needle = site["must_contain"]
+    rendered = await wait_for_needle(frame, needle)
+
+    if site.get("log_raw"):
+        # Let the frame settle so the dump reflects the fully rendered app
+        await frame.wait_for_load_state("networkidle")
+        content = await frame.content()
+        await log_raw_html(content, site, suffix=suffix)
+        return needle in content
+
+    if rendered:
+        return True
+
+    # must_contain may sit in markup rather than visible text; scan it in-page
+    # instead of shipping the whole DOM over CDP
+    return await frame.evaluate(
+        "(needle) => document.documentElement.outerHTML.includes(needle)", needle
+    )
 
 
 async def evaluate_iframe_content(page, site, dry_run=False):
     """Evaluate iframe content to determine if site is up. Restart if content missing."""
-    iframe_element = await page.query_selector('iframe[title="streamlitApp"]')
+    iframe_element = await wait_for_iframe(page, timeout=IFRAME_TIMEOUT)
 
     if not iframe_element:
         log_site("info", logger, site, "No iframe found — attempting restart")
-        if site.get("log_raw"):
-            try:
-                html = await page.content()
-                log_raw_html(html, site, suffix="raw_iframe")
-            except Exception as dump_err:
-                log_site(
-                    "warning", logger, site, f"failed to dump page HTML: {dump_err}"
-                )
+        await dump_page_html(page, site, "raw_iframe")
         restart_result = await restart_site_if_needed(page, site, dry_run=dry_run)
         
-        # If wake-up was attempted, re-check for iframe
-        if restart_result == "restarted" and not dry_run:
-            log_site("info", logger, site, "Re-checking site after wake-up attempt...")
-            await page.wait_for_timeout(3000)  # Wait for site to reload
-            
-            # Try to find iframe again
-            iframe_element = await page.query_selector('iframe[title="streamlitApp"]')
+        # After a wake-up, or when there was no button to click (a slow app
+        # rather than a sleeping one), the app iframe may still appear
+        if restart_result in ("restarted", "down"):
+            woke = restart_result == "restarted"
+            stage = "wake-up attempt" if woke else "finding no wake-up button"
+            log_site("info", logger, site, f"Re-checking site after {stage}...")
+            # Wait for the app iframe to come back rather than a fixed sleep
+            iframe_element = await wait_for_iframe(page, timeout=IFRAME_TIMEOUT)
             if iframe_element:
                 try:
                     frame = await iframe_element.content_frame()
-                    await frame.wait_for_load_state("networkidle")
-                    content = await frame.content()
-                    if site.get("log_raw"):
-                        log_raw_html(content, site, suffix="iframe_after_wakeup")
-                    
                     needle = site["must_contain"]
-                    if needle in content:
-                        log_site("info", logger, site, f"Wake-up successful! Found '{needle}'.")
+                    suffix = "iframe_after_wakeup" if woke else "iframe"
+                    if await frame_contains_needle(frame, site, suffix):
+                        log_site("info", logger, site, f"Found '{needle}' after {stage}. Site is up.")
                         return "up"
                     else:
-                        log_site("warning", logger, site, f"Wake-up attempted but content still missing: '{needle}'.")
+                        log_site("warning", logger, site, f"Content still missing after {stage}: '{needle}'.")
                         return "down"
                 except Exception as e:
                     msg = str(e).splitlines()[0]
-                    log_site("warning", logger, site, f"Post-wake-up iframe check failed: {msg}")
+                    log_site("warning", logger, site, f"Iframe re-check after {stage} failed: {msg}")
                     return "down"
             else:
-                log_site("warning", logger, site, "Wake-up attempted but iframe still not found.")
+                log_site("warning", logger, site, f"Iframe still not found after {stage}.")
                 return "down"
         
         return restart_result
 
     try:
         frame = await iframe_element.content_frame()
-        await frame.wait_for_load_state("networkidle")
-
-        content = await frame.content()
-        if site.get("log_raw"):
-            log_raw_html(content, site, suffix="iframe")
-
         needle = site["must_contain"]
-        if needle in content:
+        if await frame_contains_needle(frame, site, "iframe"):
             log_site("info", logger, site, f"Found '{needle}'. Site is up.")
             return "up"
 
@@ -91,37 +179,27 @@ async def evaluate_iframe_content(page, site, dry_run=False):
     except Exception as e:
         msg = str(e).splitlines()[0]
         log_site("warning", logger, site, f"Iframe load or content check failed: {msg}")
-        if site.get("log_raw"):
-            try:
-                html = await page.content()
-                log_raw_html(html, site, suffix="raw_iframe")
-            except Exception as dump_err:
-                log_site(
-                    "warning", logger, site, f"failed to dump page HTML: {dump_err}"
-                )
+        await dump_page_html(page, site, "raw_iframe")
         return "down"
 
 
-async def check_site(playwright, site, dry_run=False):
-    """Load the site URL in a browser and determine if it's up based on expected content."""
-    browser = await playwright.chromium.launch()
-    page = await browser.new_page()
-    assert callable(page.frame), "page.frame has been overwritten or misused"
+async def check_on_page(page, site, dry_run=False):
+    """
+    Load the site URL on an existing page and determine if it's up.
+
+    The URL is trusted as-is; config_loader rejects invalid URLs at load time.
 
+    :param page: Playwright page to navigate; the caller owns its lifecycle.
+    :param site: Dictionary with config metadata for the site.
+    :param dry_run: If True, skips any restart logic.
+    :return: Dict with the site name and final status.
+    """
     result = {"name": site["name"], "status": "unknown"}
 
-    if not is_valid_url(site["url"]):
-        log_site("error", logger, site, f"Invalid URL '{site['url']}' — skipping.")
-        result["status"] = "invalid"
-        return result
-
     try:
         log_site("info", logger, site, f"Checking {site['name']} at {site['url']}")
-        await page.goto(site["url"], timeout=15000)
-        
-        # Wait for page to fully load and dynamic content
-        await page.wait_for_load_state("networkidle", timeout=10000)
-        await page.wait_for_timeout(3000)  # Extra wait for Streamlit to render
+        # Readiness is judged by the iframe and needle waits, not network quiet
+        await page.goto(site["url"], wait_until="domcontentloaded", timeout=15000)
 
         # Delegate to iframe logic
         result["status"] = await evaluate_iframe_content(page, site, dry_run=dry_run)
@@ -129,54 +207,292 @@ async def check_site(playwright, site, dry_run=False):
     except Exception as e:
         msg = str(e).splitlines()[0]
         log_site("error", logger, site, f"check failed: {msg}")
-        if site.get("log_raw"):
-            try:
-                html = await page.content()
-                log_raw_html(html, site, suffix="raw_timeout")
-            except Exception as dump_err:
-                log_site(
-                    "warning", logger, site, f"failed to dump raw HTML: {dump_err}"
-                )
+        await dump_page_html(page, site, "raw_timeout")
         result["status"] = "error"
 
+    return result
+
+
+def build_probe(site, dry_run=False):
+    """
+    Specialize a site check into a closure over its fixed per-site settings.
+
+    :param site: Dictionary with config metadata for the site.
+    :param dry_run: If True, skips any restart logic.
+    :return: Coroutine function taking a page and returning the result dict.
+    """
+    default_blocked = (
+        STREAMLIT_BLOCKED_RESOURCES if site["is_streamlit"] else DEFAULT_BLOCKED_RESOURCES
+    )
+    blocked = frozenset(site.get("block_resources", default_blocked))
+
+    async def probe(page):
+        await block_resources(page, blocked)
+        return await check_on_page(page, site, dry_run=dry_run)
+
+    return probe
+
+
+async def _reset_page(context, page):
+    # Drop the last site's routes and navigate away so the next site starts
+    # clean; a page that can't be reset (e.g. crashed) is replaced
+    try:
+        await page.unroute("**/*")
+        await page.goto("about:blank")
+        return page
+    except Exception:
+        if not page.is_closed():
+            await page.close()
+        return await context.new_page()
+
+
+def default_concurrency(site_count: int) -> int:
+    """
+    Return the default number of sites checked at once.
+
+    Uses TICKLE_CONCURRENCY when set to a positive integer, else 2 * CPUs,
+    never more than the number of sites.
+
+    :param site_count: Number of sites about to be checked.
+    :return: Worker count, at least 1.
+    """
+    limit = 2 * (os.cpu_count() or 1)
+    env_limit = os.getenv("TICKLE_CONCURRENCY")
+    if env_limit:
+        try:
+            env_value = int(env_limit)
+        except ValueError:
+            env_value = 0
+        if env_value >= 1:
+            limit = env_value
+        else:
+            logger.warning(f"Ignoring TICKLE_CONCURRENCY={env_limit!r}: not a positive integer")
+    return max(1, min(site_count, limit))
+
+
+async def iter_checks(browser, sites, dry_run=False, max_concurrency=None):
+    """
+    Check sites on a shared browser, yielding each result as soon as it finishes.
+
+    A fixed pool of workers drains a queue, each reusing one context and page,
+    which bounds concurrency and skips per-site context setup. Sites a failed
+    worker never reached are simply not yielded.
+
+    :param browser: Open browser to create worker contexts on, or a persistent
+        context for workers to open pages in.
+    :param sites: Site dictionaries with already-validated URLs.
+    :param dry_run: If True, skips any restart logic.
+    :param max_concurrency: Max sites checked at once (default: see default_concurrency())
+    :return: Async iterator of result dicts in completion order.
+    """
+    limit = max(1, max_concurrency or default_concurrency(len(sites)))
+    queue = asyncio.Queue()
+    for site in sites:
+        queue.put_nowait((site, build_probe(site, dry_run)))
+    done = asyncio.Queue()
+
+    # A persistent context (TICKLE_PROFILE_DIR) is shared; workers only own pages
+    shared = not hasattr(browser, "new_context")
+
+    async def worker():
+        try:
+            context = browser if shared else await browser.new_context()
+            page = None
+            try:
+                page = await context.new_page()
+                while not queue.empty():
+                    site, probe = queue.get_nowait()
+                    try:
+                        result = await asyncio.wait_for(probe(page), SITE_CHECK_TIMEOUT)
+                    except asyncio.TimeoutError:
+                        log_site(
+                            "error", logger, site,
+                            f"check exceeded {SITE_CHECK_TIMEOUT}s — giving up.",
+                        )
+                        result = {"name": site["name"], "status": "error"}
+                    except Exception as e:
+                        msg = str(e).splitlines()[0]
+                        log_site("error", logger, site, f"check failed: {msg}")
+                        result = {"name": site["name"], "status": "error"}
+                    await done.put(result)
+                    page = await _reset_page(context, page)
+            finally:
+                if not shared:
+                    await context.close()
+                elif page is not None and not page.is_closed():
+                    await page.close()
+        except Exception as e:
+            msg = str(e).splitlines()[0]
+            logger.error(f"Check worker failed: {msg}")
+        finally:
+            await done.put(None)  # one sentinel per worker, even on failure
+
+    worker_count = min(limit, len(sites))
+    workers = [asyncio.create_task(worker()) for _ in range(worker_count)]
+    try:
+        finished = 0
+        while finished < worker_count:
+            result = await done.get()
+            if result is None:
+                finished += 1
+            else:
+                yield result
     finally:
-        await browser.close()
-        return result
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
 
+def _append_text(path: str, text: str) -> None:
+    with open(path, "a", encoding="utf-8") as report:
+        report.write(text)
 
-def write_uptime_report(results, log_path="logs/uptime_report.log"):
-    """Append a timestamped summary of site statuses to a report log."""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open(log_path, "a", encoding="utf-8") as report:
-        for result in results:
-            report.write(f"{timestamp},{result['name']},{result['status']}\n")
 
+def report_timestamp() -> str:
+    """Return the current time formatted for uptime report rows."""
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+async def write_uptime_report(results, log_path="logs/uptime_report.log", timestamp=None):
+    """
+    Append a timestamped summary of site statuses to a report log off the event loop.
 
-async def check_sites(config_path: str = "config/sites.json", site_name: str = None, dry_run: bool = False):
+    :param results: List of dicts with 'name' and 'status' keys.
+    :param log_path: File path to write the report entry.
+    :param timestamp: Run timestamp shared by every row of one run (default: now).
+    :return: None
+    """
+    timestamp = timestamp or report_timestamp()
+    rows = "".join(
+        f"{timestamp},{result['name']},{result['status']}\n" for result in results
+    )
+    await asyncio.to_thread(_append_text, log_path, rows)
+
+
+async def open_browser(playwright):
+    """
+    Open the browser checks run on.
+
+    Connects to the browser server in TICKLE_DAEMON_WS if set. Otherwise, if
+    TICKLE_PROFILE_DIR is set, launches Chromium on that profile directory so
+    its HTTP cache, DNS and TLS session state carry over between runs.
+    Otherwise launches a fresh Chromium.
+
+    :param playwright: The started Playwright instance.
+    :return: Browser instance, or a persistent BrowserContext for a profile;
+        closing it only disconnects from a remote server.
+    """
+    ws_endpoint = os.getenv("TICKLE_DAEMON_WS")
+    if ws_endpoint:
+        return await playwright.chromium.connect(ws_endpoint)
+    profile_dir = os.getenv("TICKLE_PROFILE_DIR")
+    if profile_dir:
+        return await playwright.chromium.launch_persistent_context(profile_dir, headless=True)
+    return await playwright.chromium.launch()
+
+
+async def browser_is_open(browser) -> bool:
+    """
+    Report whether a browser from open_browser() is still usable.
+
+    :param browser: Browser or persistent BrowserContext.
+    :return: True if checks can still run on it.
+    """
+    is_connected = getattr(browser, "is_connected", None)
+    if is_connected is not None:
+        return is_connected()
+    # Persistent contexts have no is_connected(); try opening a page instead
+    try:
+        page = await browser.new_page()
+        await page.close()
+        return True
+    except Exception:
+        return False
+
+
+async def check_sites(
+    config_path: str = "config/sites.json",
+    site_name: str = None,
+    dry_run: bool = False,
+    browser=None,
+    max_concurrency: int = None,
+):
     """
     Check site availability for all configured sites or a specific site.
     
     :param config_path: Path to sites configuration file
     :param site_name: Optional specific site name to check
     :param dry_run: If True, skips any restart logic
+    :param browser: Optional already-open browser to reuse; it is left open
+    :param max_concurrency: Max sites checked at once (default: see default_concurrency())
     :return: List of result dictionaries with 'name' and 'status' keys
     """
-    sites = load_and_validate_config(config_path)
-
     if site_name:
-        valid_names = [s["name"] for s in sites]
-        sites = [s for s in sites if s["name"] == site_name]
-        if not sites:
+        site_index = load_site_index(config_path)
+        try:
+            sites = [site_index[site_name]]
+        except KeyError:
             logger.error(
-                f"'{site_name}' not found. Valid site names are: {valid_names}"
+                f"'{site_name}' not found. Valid site names are: {list(site_index)}"
             )
             return []
+    else:
+        sites = load_and_validate_config(config_path)
+
+    # Rows stream out as sites finish, but they all belong to one run
+    run_timestamp = report_timestamp()
+
+    # A sleeping Streamlit app serves the same static shell as an awake one,
+    # so only the browser can judge (and wake) it; other sites whose text is
+    # served statically are up without launching a browser
+    checked = {}
+    pending = [site for site in sites if site["is_streamlit"]]
+    plain_sites = [site for site in sites if not site["is_streamlit"]]
+    probes = await asyncio.gather(*(quick_http_probe(site) for site in plain_sites))
+    for site, found in zip(plain_sites, probes):
+        if found:
+            checked[site["name"]] = {"name": site["name"], "status": "up"}
+        elif found is False:
+            # Unreachable and no restart logic: the browser has nothing to add
+            log_site("warning", logger, site, "Unreachable over HTTP. Site is down.")
+            checked[site["name"]] = {"name": site["name"], "status": "down"}
+        else:
+            # The needle may just be rendered by JavaScript
+            pending.append(site)
 
-    async with async_playwright() as playwright:
-        tasks = [check_site(playwright, site, dry_run=dry_run) for site in sites]
-        results = await asyncio.gather(*tasks)
-        write_uptime_report(results)
-        return results
+    # Rows for sites settled without a browser go out before the slow checks
+    if checked:
+        await write_uptime_report(list(checked.values()), timestamp=run_timestamp)
+
+    async def record(browser):
+        # Log each row as its check finishes so a hung site can't hold back the rest
+        async for result in iter_checks(browser, pending, dry_run, max_concurrency):
+            checked[result["name"]] = result
+            await write_uptime_report([result], timestamp=run_timestamp)
+
+    if pending and browser is not None:
+        await record(browser)
+    elif pending:
+        async with async_playwright() as playwright:
+            # One Chromium process serves every site; workers share it via contexts
+            # (or pages, on a persistent profile)
+            browser = await open_browser(playwright)
+            try:
+                await record(browser)
+            finally:
+                await browser.close()
+
+    missing = [
+        {"name": site["name"], "status": "error"}
+        for site in pending
+        if site["name"] not in checked
+    ]
+    if missing:
+        checked.update((result["name"], result) for result in missing)
+        await write_uptime_report(missing, timestamp=run_timestamp)
+
+    results = [checked[site["name"]] for site in sites]
+    return results
 
 
 if __name__ == "__main__":
@@ -198,13 +514,5 @@ if __name__ == "__main__":
     print("\nCheck Results:")
     print("-" * 40)
     for result in results:
-        status_symbol = {
-            "up": "✅",
-            "down": "❌", 
-            "restarted": "🔄",
-            "error": "⚠️",
-            "invalid": "❓",
-            "dry_run": "🔍"
-        }.get(result["status"], "❓")
-        
+        status_symbol = STATUS_SYMBOLS.get(result["status"], "❓")
         print(f"{status_symbol} {result['name']:<20} {result['status']}")
\ No newline at end of file
@@ -0,0 +1,61 @@
+"""
+Long-running monitor for tickle_streamlit.
+
+Keeps one Chromium process (or one connection to a remote browser server)
+alive between check cycles so scheduled checks skip the browser cold start.
+"""
+
+import asyncio
+
+from playwright.async_api import async_playwright
+
+from utils.log_util import app_logger
+
+from .core import browser_is_open, check_sites, open_browser
+
+logger = app_logger(__name__, log_file="logs/uptime.log")
+
+DEFAULT_INTERVAL = 3600
+
+
+async def run_daemon(
+    config_path: str = "config/sites.json",
+    interval: float = DEFAULT_INTERVAL,
+    dry_run: bool = False,
+    max_concurrency: int = None,
+) -> None:
+    """
+    Check all sites every `interval` seconds on a persistent browser.
+
+    The browser is reopened if it crashes or, when TICKLE_DAEMON_WS is set,
+    if the connection to the remote browser server drops.
+
+    :param config_path: Path to sites configuration file
+    :param interval: Seconds to wait between check cycles
+    :param dry_run: If True, skips any restart logic
+    :param max_concurrency: Max sites checked at once (default: see default_concurrency())
+    :return: None
+    """
+    async with async_playwright() as playwright:
+        browser = None
+        try:
+            while True:
+                try:
+                    if browser is None or not await browser_is_open(browser):
+                        if browser is not None:
+                            logger.warning("Browser disconnected — reopening.")
+                        browser = await open_browser(playwright)
+                    await check_sites(
+                        config_path,
+                        dry_run=dry_run,
+                        browser=browser,
+                        max_concurrency=max_concurrency,
+                    )
+                except Exception as e:
+                    msg = str(e).splitlines()[0]
+                    logger.error(f"Check cycle failed: {msg}")
+
+                await asyncio.sleep(interval)
+        finally:
+            if browser is not None and await browser_is_open(browser):
+                await browser.close()
@@ -4,44 +4,148 @@ Configuration loader and schema validator for tickle_streamlit.
 This module ensures all site config entries conform to required structure.
 """
 
+import functools
 import json
-from urllib.parse import urlparse
+import os
+import re
+from pathlib import Path
+from types import MappingProxyType
 
 from utils.log_util import app_logger
 
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to stdlib json
+    orjson = None
+
 logger = app_logger(__name__, log_file="logs/uptime.log")
 
 REQUIRED_KEYS = ["name", "url", "selector", "is_streamlit"]
-OPTIONAL_KEYS = ["must_contain"]
+OPTIONAL_KEYS = ["must_contain", "log_raw", "block_resources"]
+
+
+# http(s) scheme followed by a non-empty host
+HTTP_URL_RE = re.compile(r"^https?://[^/?#\s]+", re.IGNORECASE)
 
 
 def is_valid_url(url: str) -> bool:
-    parsed = urlparse(url)
-    return all([parsed.scheme in ("http", "https"), parsed.netloc])
+    return HTTP_URL_RE.match(url) is not None
 
 
-def load_and_validate_config(path: str = "config/sites.json") -> list[dict]:
-    """
-    Load site config and validate schema for each entry.
+def _loads(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
-    :param path: Path to sites.json config
-    :return: List of valid site dictionaries
-    """
-    with open(path, "r") as f:
-        data = json.load(f)
 
+def _dumps(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+
+def _file_stamp(path) -> tuple:
+    # (mtime_ns, size) is part of every cache key so any write invalidates it,
+    # even one landing within the filesystem's timestamp granularity
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=8)
+def _read_config(path: str, stamp: tuple) -> tuple:
+    with open(path, "rb") as f:
+        return tuple(_loads(f.read()))
+
+
+@functools.lru_cache(maxsize=8)
+def _validate_config(path: str, stamp: tuple) -> tuple:
     valid_sites = []
-    for site in data:
+    seen_names = set()
+    for site in _read_config(path, stamp):
         if not all(k in site for k in REQUIRED_KEYS):
             logger.error(f"Skipping site: missing required keys — {site}")
             continue
+        # Results and report rows are keyed by name, so names must be unique
+        if site["name"] in seen_names:
+            logger.error(f"{site['name']}: Duplicate site name — skipping later entry.")
+            continue
         if not isinstance(site["is_streamlit"], bool):
             logger.error(f"{site['name']}: 'is_streamlit' must be true/false.")
             continue
         if not is_valid_url(site["url"]):
             logger.error(f"{site['name']}: Invalid URL — {site['url']}")
             continue
+        blocked = site.get("block_resources", [])
+        if not isinstance(blocked, list) or not all(isinstance(t, str) for t in blocked):
+            logger.error(f"{site['name']}: 'block_resources' must be a list of strings.")
+            continue
+        seen_names.add(site["name"])
         valid_sites.append(site)
 
     logger.info(f"Loaded {len(valid_sites)} valid site(s) from config.")
-    return valid_sites
+    return tuple(valid_sites)
+
+
+@functools.lru_cache(maxsize=8)
+def _index_config(path: str, stamp: tuple) -> MappingProxyType:
+    return MappingProxyType({site["name"]: site for site in _validate_config(path, stamp)})
+
+
+def load_config(path: str = "config/sites.json") -> list[dict]:
+    """
+    Load raw site entries without validation, cached until the file changes.
+
+    :param path: Path to sites.json config
+    :return: List of site dictionaries as stored, or [] if the file is missing
+    """
+    try:
+        stamp = _file_stamp(path)
+    except FileNotFoundError:
+        return []
+    return list(_read_config(str(path), stamp))
+
+
+def save_config(path: str, sites: list[dict]) -> None:
+    """
+    Atomically write site entries to the config file as indented JSON.
+
+    The payload goes to a sibling temp file that is renamed over the target,
+    so readers see either the old or the new file, never a partial write.
+
+    :param path: Path to sites.json config
+    :param sites: List of site dictionaries to store
+    :return: None
+    """
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_name(target.name + ".tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(_dumps(sites))
+        os.replace(tmp_path, target)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def load_and_validate_config(path: str = "config/sites.json") -> list[dict]:
+    """
+    Load site config and validate schema for each entry.
+
+    Results are cached on (path, mtime, size) so repeated calls skip parsing and
+    validation until the file is rewritten.
+
+    :param path: Path to sites.json config
+    :return: List of valid site dictionaries
+    """
+    return list(_validate_config(str(path), _file_stamp(path)))
+
+
+def load_site_index(path: str = "config/sites.json") -> MappingProxyType:
+    """
+    Map site names to validated site dicts, cached until the file changes.
+
+    :param path: Path to sites.json config
+    :return: Read-only mapping of site name to site dictionary
+    """
+    return _index_config(str(path), _file_stamp(path))
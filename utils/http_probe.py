@@ -0,0 +1,91 @@
+"""
+Lightweight HTTP pre-check for tickle_streamlit.
+
+Fetches a site's raw HTML without a browser so that healthy sites whose
+must_contain text is served statically can skip Playwright entirely.
+"""
+
+import asyncio
+import hashlib
+import os
+import time
+import urllib.request
+from typing import Optional
+
+from utils.log_util import app_logger, log_site
+
+logger = app_logger(__name__, log_file="logs/uptime.log")
+
+CACHE_DIR = "logs/.cache"
+PROBE_TIMEOUT = 10
+USER_AGENT = "tickle_streamlit"
+
+
+def _cache_path(url: str) -> str:
+    return os.path.join(CACHE_DIR, hashlib.sha1(url.encode("utf-8")).hexdigest())
+
+
+def _read_cached(url: str, max_age: float) -> Optional[str]:
+    path = _cache_path(url)
+    try:
+        if time.time() - os.path.getmtime(path) > max_age:
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def fetch_html(url: str, max_age: float = 0) -> str:
+    """
+    Fetch the raw HTML for a URL, optionally through an on-disk cache.
+
+    :param url: URL to fetch.
+    :param max_age: Seconds a cached response stays fresh; 0 disables the cache.
+    :return: Decoded response body.
+    """
+    if max_age > 0:
+        cached = _read_cached(url, max_age)
+        if cached is not None:
+            return cached
+
+    request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    with urllib.request.urlopen(request, timeout=PROBE_TIMEOUT) as response:
+        charset = response.headers.get_content_charset() or "utf-8"
+        html = response.read().decode(charset, errors="replace")
+
+    if max_age > 0:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(_cache_path(url), "w", encoding="utf-8") as f:
+            f.write(html)
+    return html
+
+
+async def quick_http_probe(site: dict, max_age: float = 0) -> Optional[bool]:
+    """
+    Check whether a site's must_contain text appears in its static HTML.
+
+    :param site: Site dict from config.
+    :param max_age: Seconds a cached response stays fresh; 0 disables the cache.
+    :return: True if the text was found, False if the fetch failed, or None if
+        the page loaded without the text (it may be rendered by JavaScript).
+    """
+    needle = site.get("must_contain")
+    if not needle:
+        return None
+
+    try:
+        html = await asyncio.to_thread(fetch_html, site["url"], max_age)
+    except Exception as e:
+        # Any fetch or decode failure (truncated body, unknown charset, ...)
+        # only means this site falls back to the browser
+        msg = str(e).splitlines()[0] if str(e) else type(e).__name__
+        log_site("debug", logger, site, f"HTTP probe failed: {msg}")
+        return False
+
+    if needle in html:
+        log_site("info", logger, site, f"Found '{needle}' in static HTML. Site is up.")
+        return True
+
+    log_site("debug", logger, site, "Text not in static HTML.")
+    return None
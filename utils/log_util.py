@@ -18,9 +18,11 @@ def log_site(level: str, logger: logging.Logger, site: dict, message: str) -> No
     :param site: Site dict from config, expected to have "name"
     :param message: Log message string
     """
-    name = site.get("name", "<unnamed>")
-    log_fn = getattr(logger, level, logger.info)
-    log_fn(f"{name}: {message}", stacklevel=2)
+    levelno = logging.getLevelName(level.upper())
+    if not isinstance(levelno, int):
+        levelno = logging.INFO
+    # %-args defer building the final line until a handler will emit it
+    logger.log(levelno, "%s: %s", site.get("name", "<unnamed>"), message, stacklevel=2)
 
 
 def app_logger(name, level=None, log_file=None):
@@ -33,14 +35,18 @@ def app_logger(name, level=None, log_file=None):
     :param log_file: Optional. If provided, logs will also be written to this file.
     :return: Configured logger instance.
     """
+    logger = logging.getLogger(name)
+    # Already configured (e.g. module imported under two names): reuse as-is
+    # rather than stacking or leaking handlers
+    if logger.handlers:
+        return logger
+
     # Resolve level from env or fallback
     env_level = os.getenv("LOGLEVEL", "").upper()
     resolved_level = getattr(logging, env_level, None) if env_level else None
     level = level or resolved_level or logging.INFO
 
-    logger = logging.getLogger(name)
     logger.setLevel(level)
-    logger.handlers.clear()
 
     formatter = logging.Formatter(
         fmt="%(asctime)s - %(levelname)s - %(module)s: %(message)s",
@@ -52,7 +58,8 @@ def app_logger(name, level=None, log_file=None):
     logger.addHandler(console_handler)
 
     if log_file:
-        file_handler = logging.FileHandler(log_file)
+        # delay: don't open the file until the first record is written
+        file_handler = logging.FileHandler(log_file, delay=True)
         file_handler.setLevel(level)
         file_handler.setFormatter(formatter)
         logger.addHandler(file_handler)
@@ -5,24 +5,72 @@ This module defines platform-specific restart logic for monitored sites.
 Currently supports Streamlit-hosted apps with a wake-up button trigger.
 """
 
+import asyncio
+import base64
+import gzip
+import json
+import logging
+import time
+from logging.handlers import RotatingFileHandler
+
 from playwright.async_api import Page
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from utils.log_util import app_logger, log_site
 
 logger = app_logger(__name__, log_file="logs/uptime.log")
 
+# Wake-up button shown by Streamlit Community Cloud to app owners and viewers
+WAKEUP_SELECTOR = (
+    'button[data-testid="wakeup-button-owner"], button[data-testid="wakeup-button-viewer"]'
+)
+
+# How long to wait (ms) for the wake-up button once #root has rendered
+WAKEUP_BUTTON_TIMEOUT = 5000
+
+# Every raw dump is one gzip+base64 JSON line in a single rotating file,
+# instead of one HTML file per site per run
+RAW_DUMP_FILE = "logs/raw_dumps.jsonl"
+RAW_DUMP_MAX_BYTES = 10 * 1024 * 1024
+RAW_DUMP_BACKUPS = 3
+
+raw_dump_logger = logging.getLogger(f"{__name__}.raw_dumps")
+raw_dump_logger.propagate = False
+raw_dump_logger.setLevel(logging.INFO)
+if not raw_dump_logger.handlers:
+    raw_dump_logger.addHandler(
+        RotatingFileHandler(
+            RAW_DUMP_FILE,
+            maxBytes=RAW_DUMP_MAX_BYTES,
+            backupCount=RAW_DUMP_BACKUPS,
+            encoding="utf-8",
+            delay=True,
+        )
+    )
+
 
-def log_raw_html(html: str, site: dict, suffix: str = "raw") -> None:
+def _write_raw_dump(html: str, site_name: str, suffix: str) -> None:
+    record = {
+        "ts": time.time(),
+        "site": site_name,
+        "suffix": suffix,
+        "html_gz_b64": base64.b64encode(gzip.compress(html.encode("utf-8"))).decode("ascii"),
+    }
+    raw_dump_logger.info(json.dumps(record))
+
+
+async def log_raw_html(html: str, site: dict, suffix: str = "raw") -> None:
     """
-    Dump raw HTML content to a file for inspection and log the action.
+    Append raw HTML content to the raw dump log for inspection and log the action.
+
+    Compression and the write run on a worker thread so large dumps don't
+    stall other checks.
 
     :param html: Raw HTML content as a string.
     :param site: Dictionary with site metadata.
-    :param suffix: Suffix for filename to distinguish contexts (e.g. 'raw', 'iframe').
+    :param suffix: Label for the dump context (e.g. 'raw', 'iframe').
     :return: None
     """
-    filename = f"logs/{site['name'].replace(' ', '_')}_{suffix}.html"
-    with open(filename, "w", encoding="utf-8") as f:
-        f.write(html)
+    await asyncio.to_thread(_write_raw_dump, html, site["name"], suffix)
     log_site("debug", logger, site, f"Dumped HTML for inspection ({suffix}).")
 
 
@@ -33,25 +81,31 @@ async def restart_site_if_needed(page: Page, site: dict, dry_run: bool = False)
     :param page: The Playwright page instance currently loaded.
     :param site: A dictionary containing site metadata from config.
     :param dry_run: If True, skip any restart actions.
-    :return: None
+    :return: "restarted", "dry_run", "down" (no wake-up button; the caller
+        should re-check for the app), "error", or "no_logic".
     """
     if site.get("is_streamlit"):
         try:
-            await page.wait_for_load_state("networkidle")
+            # Streamlit keeps a websocket open, so networkidle may never fire;
+            # the rendered root is the readiness signal that matters here
             await page.wait_for_selector("#root", timeout=10000)
 
             if dry_run:
                 log_site("info", logger, site, "Dry run enabled — skipping wake-up.")
                 return "dry_run"
 
-            await page.wait_for_selector(
-                'button[data-testid="wakeup-button-owner"], button[data-testid="wakeup-button-viewer"]',
-                timeout=5000,
-            )
+            # The button renders after #root, so it needs the same window the
+            # old wait_for_selector() had. A miss is "down", not "error": the
+            # app isn't asleep, and the caller re-checks for its iframe
+            wakeup_button = page.locator(WAKEUP_SELECTOR).first
+            try:
+                await wakeup_button.wait_for(state="visible", timeout=WAKEUP_BUTTON_TIMEOUT)
+            except PlaywrightTimeoutError:
+                log_site("warning", logger, site, "No wake-up button found — nothing to click.")
+                return "down"
+
             log_site("warning", logger, site, "Wake-up button found. Clicking.")
-            await page.click(
-                'button[data-testid="wakeup-button-owner"], button[data-testid="wakeup-button-viewer"]'
-            )
+            await wakeup_button.click()
             
             # Wait for site to reload after wake-up
             await page.wait_for_timeout(5000)